@@ -1,48 +1,46 @@
 import os
-import csv
 import sys
 import logging
-import psycopg2
+import psycopg
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger(__name__)
 
 OUTPUT_FILE = "star_counts.csv"
 
+# COPY streams rows from Postgres straight into the file — no fetchall()
+# materializing 100k rows as Python objects, no csv.writer re-encoding.
+DUMP_SQL = """
+COPY (
+    SELECT
+        node_id,
+        full_name,
+        owner_login,
+        name,
+        stars,
+        scraped_at,
+        primary_language,
+        description
+    FROM repos_view
+    ORDER BY stars DESC
+) TO STDOUT WITH CSV HEADER
+"""
+
 
 def dump(db_url: str) -> None:
     log.info("Connecting to database …")
-    conn = psycopg2.connect(db_url)
-
-    with conn.cursor() as cur:
-        log.info("Querying latest_star_counts view …")
-        cur.execute(
-            """
-            SELECT
-                node_id,
-                full_name,
-                owner_login,
-                name,
-                stars,
-                scraped_at,
-                primary_language,
-                description
-            FROM repos_view
-            ORDER BY stars DESC
-            """
-        )
-        rows = cur.fetchall()
-        columns = [desc[0] for desc in cur.description]
+    conn = psycopg.connect(db_url)
 
-    conn.close()
+    log.info("Streaming repos_view to %s …", OUTPUT_FILE)
+    with conn.cursor() as cur, open(OUTPUT_FILE, "wb") as f:
+        with cur.copy(DUMP_SQL) as copy:
+            for chunk in copy:
+                f.write(chunk)
+        rows = cur.rowcount
 
-    log.info("Writing %d rows to %s …", len(rows), OUTPUT_FILE)
-    with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(columns)
-        writer.writerows(rows)
+    conn.close()
 
-    log.info("Dump complete: %s (%d rows)", OUTPUT_FILE, len(rows))
+    log.info("Dump complete: %s (%d rows)", OUTPUT_FILE, rows)
 
 
 if __name__ == "__main__":
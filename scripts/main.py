@@ -32,8 +32,16 @@ import os
 import sys
 import argparse
 
-import httpx
-import psycopg2
+import psycopg
+
+# uvloop swaps the stdlib event loop for libuv's — markedly cheaper I/O
+# dispatch with many concurrent sockets. Linux/macOS only, so the Windows
+# setup from the README still runs on the default loop.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 # Application layer
 from src.application.crawl_service import CrawlApplicationService
@@ -49,9 +57,15 @@ from src.infrastructure.postgres_storage import PostgresRepoStorage
 # Logging setup
 # ---------------------------------------------------------------------------
 
+# Timestamps only when logs go to a file/CI — strftime per record is
+# surprisingly hot, and a TTY reader doesn't need it.
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
+    format=(
+        "[%(levelname)s] %(name)s — %(message)s"
+        if sys.stderr.isatty()
+        else "%(asctime)s [%(levelname)s] %(name)s — %(message)s"
+    ),
     datefmt="%H:%M:%S",
 )
 log = logging.getLogger(__name__)
@@ -80,20 +94,24 @@ def _read_env() -> tuple[str, str]:
 
 
 # Dependency wiring
-async def build_and_run(db_url: str, token: str, target: int) -> None:
+async def build_and_run(db_url: str, token: str, target: int, lean: bool = False) -> None:
 
-    # Infrastructure: create the DB connection and HTTP client
-    conn = psycopg2.connect(db_url)
-    client = httpx.AsyncClient()
+    # Infrastructure: create the DB connection. The HTTP client is owned
+    # by the orchestrator — one h2 connection pool for the whole crawl,
+    # passed into every fetch_page call.
+    conn = psycopg.connect(db_url)
 
     try:
+        # The deduplicator comes first: its read-only contains() probe is
+        # handed to the GitHub client so already-seen nodes skip parsing.
+        deduplicator = InMemoryDeduplicator()
+
         # Infrastructure implementations
-        github_client = GitHubClient(token  = token, client = client)
+        github_client = GitHubClient(token = token, lean = lean, is_seen = deduplicator.contains)
         storage = PostgresRepoStorage(conn = conn)
 
         # Application services (receive infrastructure via injection)
         query_generator = MultiDimensionalQueryGenerator()
-        deduplicator = InMemoryDeduplicator()
         orchestrator = CrawlerOrchestrator(
             fetcher = github_client,    # injected IRepoFetcher
             generator = query_generator,  # injected IQueryGenerator
@@ -118,7 +136,6 @@ async def build_and_run(db_url: str, token: str, target: int) -> None:
             sys.exit(1)
 
     finally:
-        await client.aclose()
         conn.close()
 
 
@@ -133,6 +150,11 @@ if __name__ == "__main__":
         default = DEFAULT_TARGET,
         help    = f"Number of repos to collect (default: {DEFAULT_TARGET})",
     )
+    parser.add_argument(
+        "--lean",
+        action = "store_true",
+        help   = "Fetch only star-count fields (smaller responses, lower rate-limit cost)",
+    )
     args = parser.parse_args()
     db_url, token = _read_env()
-    asyncio.run(build_and_run(db_url, token, args.target))
\ No newline at end of file
+    asyncio.run(build_and_run(db_url, token, args.target, lean=args.lean))
\ No newline at end of file
@@ -8,8 +8,18 @@ from src.domain.interfaces import IRepoFetcher, IQueryGenerator, IDeduplicator
 
 log = logging.getLogger(__name__)
 
-MAX_CONCURRENT= 15    
-RATE_LIMIT_SLEEP = 60  
+MAX_CONCURRENT= 15
+RATE_LIMIT_SLEEP = 60
+HTTP_TIMEOUT = 30.0     # per-request ceiling for the shared client
+
+
+class _StopFetch(Exception):
+    """
+    Raised by _fetch_gated when the stop signal fired while a page
+    waited for a slot — a normal end-of-crawl bail-out, deliberately
+    NOT CancelledError so it can never be confused with a worker
+    actually being cancelled during teardown.
+    """
 
 
 class CrawlerOrchestrator:
@@ -31,83 +41,194 @@ class CrawlerOrchestrator:
         self._deduplicator = deduplicator
         self._semaphore = asyncio.Semaphore(max_concurrent)
         self._max_concurrent = max_concurrent
+        # Shared rate-limit gate. Open = fetch away. When quota runs low,
+        # ONE coroutine closes it and sleeps; everyone else parks at the
+        # gate instead of grabbing a semaphore slot just to hit the same
+        # limit.
+        self._rate_gate = asyncio.Event()
+        self._rate_gate.set()
+
+    async def _fetch_gated(
+        self,
+        client: httpx.AsyncClient,
+        query_str: str,
+        cursor: str | None,
+        stop_event: asyncio.Event,
+    ) -> tuple[list[GitHubRepo], bool, str | None, int]:
+        """Fetch one page, holding a concurrency slot for the duration."""
+        await self._rate_gate.wait()
+        async with self._semaphore:
+            # The slot may have been queued for a long time (rate pause,
+            # 15 requests ahead). If the target was reached meanwhile,
+            # bail out instead of spending one more HTTP round-trip.
+            if stop_event.is_set():
+                raise _StopFetch
+            return await self._fetcher.fetch_page(client, query_str, cursor)
 
     async def _run_single_query(self,client:httpx.AsyncClient,query_str:str,target:int,out:list[GitHubRepo],stop_event: asyncio.Event) -> int:
         """
         Fetch all pages for one query string.
         Returns count of fresh repos found.
 
+        Pages are double-buffered: as soon as page N returns its cursor,
+        the request for page N+1 is scheduled as a task, so its HTTP
+        round-trip overlaps the dedup/processing of page N.
+
         Uses stop_event instead of checking a shared counter directly —
         cleaner signal mechanism between coroutines.
         """
-        cursor = None
-        found  = 0
+        found = 0
+        next_task: asyncio.Task | None = asyncio.create_task(
+            self._fetch_gated(client, query_str, None, stop_event)
+        )
 
-        while not stop_event.is_set():
-            async with self._semaphore:
+        try:
+            while not stop_event.is_set():
                 try:
-                    repos, has_next, cursor, rate = await self._fetcher.fetch_page(
-                        query_str, cursor
-                    )
+                    repos, has_next, cursor, rate = await next_task
                 except RuntimeError as exc:
                     log.warning("Query failed, skipping: %.60s | %s", query_str, exc)
                     return found    # log and skip — don't crash the whole crawl
+                except _StopFetch:
+                    # Another worker hit the target while this page sat in the
+                    # semaphore queue and _fetch_gated bailed out — a normal
+                    # end-of-crawl exit, not a cancellation of this worker.
+                    return found
+                next_task = None
+
+                # Prefetch the next page before touching this one's payload.
+                # Trust pageInfo alone: the fetch layer drops already-seen
+                # nodes, so an empty batch can just mean an all-duplicate
+                # page with fresh repos still behind it.
+                if has_next:
+                    next_task = asyncio.create_task(self._fetch_gated(client, query_str, cursor, stop_event))
+
+                fresh = await self._deduplicator.filter_fresh_async(repos)
+                out.extend(fresh)
+                found += len(fresh)
+
+                if rate < 20 and self._rate_gate.is_set():
+                    # First coroutine to notice closes the gate for everyone
+                    self._rate_gate.clear()
+                    log.info("Rate limit low (%d remaining) — pausing %ds …", rate, RATE_LIMIT_SLEEP)
+                    await asyncio.sleep(RATE_LIMIT_SLEEP)
+                    self._rate_gate.set()
+
+                if self._deduplicator.total_seen() >= target:
+                    stop_event.set()    # signal all other coroutines to stop
+
+                if next_task is None:   # last page for this query
+                    break
+        finally:
+            # Every exit — stop signal, last page, skip-on-error, this
+            # worker being cancelled, or an unexpected exception — must
+            # reap the in-flight prefetch, or it's left running against
+            # a client that's about to close.
+            if next_task is not None:
+                next_task.cancel()
+                try:
+                    await next_task
+                except (asyncio.CancelledError, RuntimeError, _StopFetch):
+                    pass
 
-            fresh = await self._deduplicator.filter_fresh_async(repos)
-            out.extend(fresh)
-            found += len(fresh)
-
-            if rate < 20:
-                log.info("Rate limit low (%d remaining) — pausing %ds …", rate, RATE_LIMIT_SLEEP)
-                await asyncio.sleep(RATE_LIMIT_SLEEP)
-
-            if not has_next or not repos:
-                break
+        return found
 
-            if self._deduplicator.total_seen() >= target:
-                stop_event.set()    # signal all other coroutines to stop
+    async def _query_worker(
+        self,
+        client: httpx.AsyncClient,
+        q_in: asyncio.Queue[str],
+        q_out: asyncio.Queue[list[GitHubRepo] | None],
+        target: int,
+        stop_event: asyncio.Event,
+    ) -> None:
+        """
+        One crawl worker: pull a query, run all its pages, push the fresh
+        repos out, repeat until the query queue is empty or stop is set.
+        """
+        while not stop_event.is_set():
+            try:
+                query_str = q_in.get_nowait()
+            except asyncio.QueueEmpty:
                 break
 
-        return found
+            batch: list[GitHubRepo] = []
+            await self._run_single_query(client, query_str, target, batch, stop_event)
+            if batch:
+                await q_out.put(batch)
 
     async def collect(self, target: int) -> AsyncIterator[list[GitHubRepo]]:
         """
         Async generator — yields batches of fresh repos as they arrive.
 
-        Processes queries in chunks of (MAX_CONCURRENT × 4).
-        Within each chunk, all queries run simultaneously via asyncio.gather.
+        A pool of MAX_CONCURRENT workers pulls queries from an input queue
+        and pushes result batches onto an output queue that this generator
+        drains. Unlike the old gather-per-chunk scheme there is no chunk
+        barrier: one slow query (long retry backoff) never stalls the
+        other workers or delays finished batches from reaching the caller.
 
         Why async generator instead of returning all at once?
         - Memory: never holds all 100k repos in RAM simultaneously
         - Progress: caller sees repos arriving in real time
         - Resilience: if it crashes at 80k, you've already saved 80k
         """
-        queries = self._generator.generate()
-        chunk_size = self._max_concurrent * 4
         stop_event = asyncio.Event()
 
-        log.info("Starting crawl | queries=%d | concurrency=%d | target=%d",len(queries), self._max_concurrent, target)
-
-        async with httpx.AsyncClient() as client:
-            for i in range(0, len(queries), chunk_size):
-                if stop_event.is_set() or self._deduplicator.total_seen() >= target:
-                    break
-
-                chunk = queries[i: i + chunk_size]
-                batch: list[GitHubRepo] = []
-
-                # Launch entire chunk simultaneously — this is the speed trick
-                await asyncio.gather(*[self._run_single_query(client, q, target, batch, stop_event)for q in chunk ])
-
-                if batch:
-                    log.info(
-                        "Chunk %d/%d | +%d new | total %d/%d",
-                        i // chunk_size + 1,
-                        (len(queries) + chunk_size - 1) // chunk_size,
-                        len(batch),
-                        self._deduplicator.total_seen(),
-                        target,
-                    )
+        # Stream the generator straight into the worker queue — no
+        # intermediate sequence between the query strategy and the pool.
+        q_in: asyncio.Queue[str] = asyncio.Queue()
+        n_queries = 0
+        for q in self._generator.generate_iter():
+            q_in.put_nowait(q)
+            n_queries += 1
+        q_out: asyncio.Queue[list[GitHubRepo] | None] = asyncio.Queue()
+
+        log.info("Starting crawl | queries=%d | workers=%d | target=%d",n_queries, self._max_concurrent, target)
+
+        # h2 multiplexes every in-flight query over one or two TLS
+        # connections instead of one TCP+TLS handshake per pooled socket;
+        # the pool is capped to match the fetch semaphore.
+        async with httpx.AsyncClient(
+            http2   = True,
+            timeout = httpx.Timeout(HTTP_TIMEOUT),
+            limits  = httpx.Limits(
+                max_connections           = self._max_concurrent,
+                max_keepalive_connections = self._max_concurrent,
+            ),
+        ) as client:
+            workers = [
+                asyncio.create_task(
+                    self._query_worker(client, q_in, q_out, target, stop_event)
+                )
+                for _ in range(self._max_concurrent)
+            ]
+
+            async def _signal_done() -> None:
+                try:
+                    await asyncio.gather(*workers)
+                finally:
+                    await q_out.put(None)   # sentinel: all workers finished
+
+            closer = asyncio.create_task(_signal_done())
+            batches = 0
+            try:
+                while True:
+                    batch = await q_out.get()
+                    if batch is None:
+                        break
+                    batches += 1
+                    if batches % 50 == 0:
+                        log.info(
+                            "Batch %d | +%d new | total %d/%d",
+                            batches, len(batch),
+                            self._deduplicator.total_seen(), target,
+                        )
                     yield batch
+                await closer   # surface any worker exception
+            finally:
+                # Caller may abandon the generator early (target reached) —
+                # don't leave workers running against a closing client.
+                for w in workers:
+                    w.cancel()
+                closer.cancel()
 
         log.info("Crawl complete - total unique repos: %d", self._deduplicator.total_seen())
\ No newline at end of file
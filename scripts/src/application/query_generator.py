@@ -1,5 +1,7 @@
 from __future__ import annotations
 import logging
+import sys
+from typing import Iterator, Sequence
 from src.domain.interfaces import IQueryGenerator
 
 log = logging.getLogger(__name__)
@@ -46,6 +48,40 @@ YEAR_RANGES = [
 ]
 
 
+def _build_queries() -> tuple[str, ...]:
+    # Interned fragments + C-level join: each "language:X" prefix is built
+    # once and reused across its 88 star×year combinations instead of
+    # re-rendered inside an f-string per query, and interning keeps the
+    # shared fragments single instances for the process lifetime.
+    langs = [sys.intern(f"language:{lang}") for lang in LANGUAGES]
+    stars_i = [sys.intern(s) for s in STAR_RANGES]
+    years_i = [sys.intern(y) for y in YEAR_RANGES]
+
+    # Primary: all three dimensions combined
+    queries = [
+        " ".join((lang, stars, year))
+        for lang in langs
+        for stars in stars_i
+        for year in years_i
+    ]
+
+    # Fallback: language + stars without year, catches repos that have no creation date metadata
+    queries += [
+        " ".join((lang, stars))
+        for lang in langs
+        for stars in stars_i
+    ]
+
+    return tuple(queries)
+
+
+# The dimensions are module constants, so the ~1,760 combinations are too —
+# partial-evaluate them once at import instead of re-running three nested
+# f-string loops on every generate() call. A tuple so nothing downstream
+# can mutate the shared instance.
+_QUERIES = _build_queries()
+
+
 class MultiDimensionalQueryGenerator(IQueryGenerator):
     """
     Generates search queries by combining language × stars × year.
@@ -55,27 +91,22 @@ class MultiDimensionalQueryGenerator(IQueryGenerator):
     cap on any single query — more combinations = more repos reachable.
     """
 
-    def generate(self) -> list[str]:
-        queries: list[str] = []
-
-        # Primary: all three dimensions combined
-        for lang in LANGUAGES:
-            for stars in STAR_RANGES:
-                for year in YEAR_RANGES:
-                    queries.append(f"language:{lang} {stars} {year}")
-
-        # Fallback: language + stars without year, catches repos that have no creation date metadata
-        for lang in LANGUAGES:
-            for stars in STAR_RANGES:
-                queries.append(f"language:{lang} {stars}")
-
+    def generate(self) -> Sequence[str]:
         log.info(
             "QueryGenerator produced %d unique queries "
             "(%d languages × %d star ranges × %d years + %d fallbacks)",
-            len(queries),
+            len(_QUERIES),
             len(LANGUAGES),
             len(STAR_RANGES),
             len(YEAR_RANGES),
             len(LANGUAGES) * len(STAR_RANGES),
         )
-        return queries
\ No newline at end of file
+        return _QUERIES
+
+    def generate_iter(self) -> Iterator[str]:
+        """
+        Yield query strings one at a time — consumers that feed a queue
+        (the orchestrator's worker pool) never need the whole sequence as
+        a value, just the stream. Backed by the same import-time cache.
+        """
+        yield from _QUERIES
\ No newline at end of file
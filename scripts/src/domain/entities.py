@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GitHubRepo:
     """
     Immutable domain entity representing a GitHub repository.
@@ -11,6 +11,10 @@ class GitHubRepo:
     frozen=True guarantees immutability — once created, no field
     can ever be changed. Data flows one way: API → entity → database.
 
+    slots=True drops the per-instance __dict__: ~200 bytes saved on each
+    of up to 100k live instances, and the hot .node_id/.star_count reads
+    go through slot descriptors instead of a dict lookup.
+
     Field names are OURS (snake_case), not GitHub's (camelCase).
     The translation happens in the anti-corruption layer, not here.
     """
@@ -26,7 +30,7 @@ class GitHubRepo:
     updated_at: datetime | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CrawlResult:
     """
     Immutable value object summarising a completed crawl run.
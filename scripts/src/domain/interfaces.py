@@ -14,8 +14,13 @@ without changing a single line of application code.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Iterator, Sequence, TYPE_CHECKING
 from .entities import GitHubRepo
 
+if TYPE_CHECKING:
+    # Type-only: the domain layer stays free of runtime dependencies.
+    import httpx
+
 class IRepoFetcher(ABC):
     """
     Contract that any GitHub API client must fulfil.
@@ -23,9 +28,10 @@ class IRepoFetcher(ABC):
     """
 
     @abstractmethod
-    async def fetch_page(self,query_str: str,cursor:str | None = None) -> tuple[list[GitHubRepo], bool, str | None, int]:
+    async def fetch_page(self,client:httpx.AsyncClient,query_str: str,cursor:str | None = None) -> tuple[list[GitHubRepo], bool, str | None, int]:
         """
-        Fetch one page of search results.
+        Fetch one page of search results over the caller's shared client —
+        one connection pool for the whole crawl, owned by the orchestrator.
 
         Returns:
             repos           — list of GitHubRepo domain objects
@@ -47,6 +53,11 @@ class IRepoStorage(ABC):
         """Insert new repos or update existing ones. Never duplicates."""
         ...
 
+    @abstractmethod
+    def flush(self) -> None:
+        """Commit everything upserted since the last flush."""
+        ...
+
     @abstractmethod
     def create_run(self) -> int:
         """Create a crawl run audit record. Returns the run ID."""
@@ -65,10 +76,19 @@ class IQueryGenerator(ABC):
     """
 
     @abstractmethod
-    def generate(self) -> list[str]:
-        """Return a list of GitHub search query strings."""
+    def generate(self) -> Sequence[str]:
+        """Return the GitHub search query strings (may be a cached tuple)."""
         ...
 
+    def generate_iter(self) -> Iterator[str]:
+        """
+        Yield the query strings one at a time.
+
+        Default just iterates generate(); implementations with a lazy
+        strategy can override to avoid materializing the full sequence.
+        """
+        yield from self.generate()
+
 
 class IDeduplicator(ABC):
     """
@@ -81,6 +101,11 @@ class IDeduplicator(ABC):
         """Return only repos not seen before. Remembers what it has seen."""
         ...
 
+    @abstractmethod
+    def contains(self, node_id: str) -> bool:
+        """Read-only probe: has this node_id been seen? Never marks it."""
+        ...
+
     @abstractmethod
     def total_seen(self) -> int:
         """Return how many unique repos have been seen so far."""